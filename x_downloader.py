@@ -11,29 +11,42 @@ Usage:
 """
 
 import argparse
+import functools
+import io
 import json
 import os
 import re
+import shutil
 import sys
+import tempfile
 import time
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from urllib.parse import urlparse
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
 except ImportError:
     print("❌ 缺少依赖: requests")
     print("   请运行: pip install requests")
     sys.exit(1)
 
+# 可选依赖：orjson 解析大体积 JSON（如长文章）更快，缺失时回退到标准库
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 # ============================================================
 # 1. URL 解析
 # ============================================================
 
 # 支持的 URL 域名
-SUPPORTED_DOMAINS = [
+SUPPORTED_DOMAINS = frozenset({
     "x.com",
     "twitter.com",
     "mobile.twitter.com",
@@ -41,7 +54,7 @@ SUPPORTED_DOMAINS = [
     "fixupx.com",
     "vxtwitter.com",
     "nitter.net",
-]
+})
 
 # 匹配 /user/status/ID 或 /i/status/ID
 STATUS_PATTERN = re.compile(r"/(?:[\w]+)/status(?:es)?/(\d+)")
@@ -70,12 +83,13 @@ def parse_tweet_url(url: str) -> tuple[str, str]:
         raise ValueError(f"无法解析 URL: {url}")
 
     # 去掉 www. 前缀
-    domain = domain.lstrip("www.")
+    if domain.startswith("www."):
+        domain = domain[4:]
 
     if domain not in SUPPORTED_DOMAINS:
         raise ValueError(
             f"不支持的域名: {domain}\n"
-            f"支持的域名: {', '.join(SUPPORTED_DOMAINS)}"
+            f"支持的域名: {', '.join(sorted(SUPPORTED_DOMAINS))}"
         )
 
     match = STATUS_PATTERN.search(parsed.path)
@@ -105,41 +119,149 @@ HEADERS = {
     "Accept": "application/json",
 }
 
+# 图片并发下载线程数（不超过连接池大小）
+DOWNLOAD_WORKERS = 8
+
+# 图片写盘缓冲区大小
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# (连接超时, 读取超时)，连接慢的主机尽快失败，不长时间占用线程池
+API_TIMEOUT = (5, 30)
+IMAGE_TIMEOUT = (5, 60)
+HEAD_TIMEOUT = (5, 10)
+
+# 全局共享 Session：复用 keep-alive 连接，避免每次请求都重新 TCP+TLS 握手
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+_adapter = HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=32,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+    ),
+)
+SESSION.mount("https://", _adapter)
+SESSION.mount("http://", _adapter)
+
+# 触发限速时单次最长等待秒数
+MAX_RATE_LIMIT_WAIT = 60
+
+
+def _wait_for_rate_limit(headers) -> None:
+    """根据响应头自适应限速：仅在额度耗尽时才等待"""
+    retry_after = headers.get("Retry-After", "")
+    remaining = headers.get("x-rate-limit-remaining", "")
+    reset = headers.get("x-rate-limit-reset", "")
+
+    delay = 0.0
+    if retry_after.isdigit():
+        delay = float(retry_after)
+    elif remaining == "0" and reset.isdigit():
+        delay = float(reset) - time.time()
+
+    if delay > 0:
+        delay = min(delay, MAX_RATE_LIMIT_WAIT)
+        print(f"⏳ API 额度已用尽，等待 {delay:.0f} 秒...")
+        time.sleep(delay)
+
+
+# 推文数据磁盘缓存目录及有效期（秒）
+CACHE_DIR = Path(tempfile.gettempdir()) / "xdl_cache"
+CACHE_TTL = 24 * 60 * 60
+
+
+def _read_tweet_cache(tweet_id: str) -> dict | None:
+    """读取未过期的推文缓存，不存在或已过期返回 None"""
+    cache_path = CACHE_DIR / f"{tweet_id}.json"
+    try:
+        if cache_path.stat().st_mtime < time.time() - CACHE_TTL:
+            return None
+        return _json_loads(cache_path.read_bytes())["tweet"]
+    except (OSError, ValueError, KeyError):
+        return None
+
 
-def fetch_tweet(tweet_id: str, screen_name: str = "i") -> dict:
+def _write_tweet_cache(tweet_id: str, tweet: dict) -> None:
+    """原子写入推文缓存（先写临时文件再 rename），失败时忽略"""
+    cache_path = CACHE_DIR / f"{tweet_id}.json"
+    tmp_path = cache_path.with_suffix(".json.tmp")
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_bytes(_json_dumps({"tweet": tweet}))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+
+@functools.lru_cache(maxsize=256)
+def fetch_tweet(tweet_id: str, screen_name: str = "i",
+                use_cache: bool = True, refresh: bool = False) -> dict:
     """
-    通过 FxTwitter API 获取推文数据。
+    通过 FxTwitter API 获取推文数据（结果在进程内缓存）。
 
     Args:
         tweet_id: 推文 ID
         screen_name: 用户名（用 'i' 也可以）
+        use_cache: 是否使用磁盘缓存
+        refresh: 忽略已有缓存，重新请求并更新缓存
 
     Returns:
         推文数据字典
     """
+    if use_cache and not refresh:
+        cached = _read_tweet_cache(tweet_id)
+        if cached is not None:
+            print(f"📦 使用缓存的推文数据 (ID: {tweet_id})")
+            return cached
+
     url = f"{FXTWITTER_API}/{screen_name}/status/{tweet_id}"
     print(f"📡 正在获取推文数据: {url}")
 
     try:
-        resp = requests.get(url, headers=HEADERS, timeout=30)
+        resp = SESSION.get(url, timeout=API_TIMEOUT)
         resp.raise_for_status()
     except requests.exceptions.ConnectionError:
         raise ConnectionError(
             "⚠️  无法连接到 FxTwitter API。请检查网络连接或使用代理。"
         )
+    except requests.exceptions.RetryError as e:
+        raise ConnectionError(f"API 请求多次重试后仍失败: {e}")
     except requests.exceptions.HTTPError as e:
         if resp.status_code == 404:
             raise ValueError(f"推文不存在或已被删除 (ID: {tweet_id})")
         raise ConnectionError(f"API 请求失败: {e}")
 
-    data = resp.json()
+    _wait_for_rate_limit(resp.headers)
+
+    data = _json_loads(resp.content)
 
     if data.get("code") != 200:
         raise ValueError(
             f"API 返回错误: {data.get('message', '未知错误')}"
         )
 
-    return data.get("tweet", {})
+    tweet = data.get("tweet", {})
+    if use_cache:
+        _write_tweet_cache(tweet_id, tweet)
+
+    return tweet
+
+
+def _json_loads(content: bytes):
+    """解析 JSON，优先使用 orjson"""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def _json_dumps(obj, indent: bool = False) -> bytes:
+    """序列化为 UTF-8 JSON，优先使用 orjson"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, ensure_ascii=False,
+                      indent=2 if indent else None).encode("utf-8")
 
 
 # ============================================================
@@ -147,34 +269,123 @@ def fetch_tweet(tweet_id: str, screen_name: str = "i") -> dict:
 # ============================================================
 
 
-def download_image(url: str, save_path: Path) -> bool:
+def _is_already_downloaded(url: str, save_path: str | Path,
+                           session: requests.Session) -> bool:
     """
-    下载单张图片到指定路径。
+    本地文件已存在且与远端大小一致（远端未给出大小或 HEAD 失败时沿用本地文件）。
 
-    Returns:
-        True 如果下载成功
+    download_image 只在下载完整后才 rename 到目标路径，已存在的文件必然完整。
     """
     try:
-        resp = requests.get(url, headers=HEADERS, timeout=60, stream=True)
+        local_size = os.path.getsize(save_path)
+    except OSError:
+        return False
+    if local_size == 0:
+        return False
+
+    try:
+        resp = session.head(url, timeout=HEAD_TIMEOUT, allow_redirects=True)
         resp.raise_for_status()
+    except requests.exceptions.RequestException:
+        return True
+
+    remote_size = resp.headers.get("content-length", "")
+    return not remote_size.isdigit() or int(remote_size) == local_size
+
+
+def download_image(url: str, save_path: str | Path,
+                   session: requests.Session | None = None,
+                   force: bool = False) -> bool:
+    """
+    下载单张图片到指定路径（目录需由调用方事先创建）。
+    已存在且大小一致的文件会被跳过。
 
-        save_path.parent.mkdir(parents=True, exist_ok=True)
+    Args:
+        session: 自定义 Session（需自带请求头），默认使用共享的 SESSION
+        force: 忽略本地已有文件，强制重新下载
 
-        with open(save_path, "wb") as f:
-            for chunk in resp.iter_content(chunk_size=8192):
-                f.write(chunk)
+    Returns:
+        True 如果下载成功（或本地已有）
+    """
+    session = session or SESSION
+    if not force and _is_already_downloaded(url, save_path, session):
+        print(f"   ⏭️  已存在，跳过: {os.path.basename(save_path)}")
+        return True
 
-        size_kb = save_path.stat().st_size / 1024
-        print(f"   ✅ 已下载: {save_path.name} ({size_kb:.1f} KB)")
+    # 先写入 .part 临时文件，完整下载后再 rename，中断时不会留下半截图片
+    part_path = f"{save_path}.part"
+    try:
+        resp = session.get(url, timeout=IMAGE_TIMEOUT, stream=True)
+        resp.raise_for_status()
+
+        # 直接从底层 raw 流拷贝，大块读写，避免逐块的 Python 循环
+        resp.raw.decode_content = True
+        with open(part_path, "wb") as f:
+            shutil.copyfileobj(resp.raw, f, DOWNLOAD_CHUNK_SIZE)
+        os.replace(part_path, save_path)
+
+        size_kb = os.path.getsize(save_path) / 1024
+        print(f"   ✅ 已下载: {os.path.basename(save_path)} ({size_kb:.1f} KB)")
         return True
 
     except Exception as e:
-        print(f"   ❌ 下载失败 {save_path.name}: {e}")
+        print(f"   ❌ 下载失败 {os.path.basename(save_path)}: {e}")
+        try:
+            os.remove(part_path)
+        except OSError:
+            pass
         return False
 
 
+def download_images(tasks: list[tuple[str, str | Path]],
+                    session: requests.Session | None = None,
+                    force: bool = False) -> list[bool]:
+    """
+    并发下载多张图片。
+
+    Args:
+        tasks: [(url, save_path), ...]
+        force: 忽略本地已有文件，强制重新下载
+
+    Returns:
+        与 tasks 顺序一致的下载结果列表
+    """
+    if not tasks:
+        return []
+
+    workers = min(DOWNLOAD_WORKERS, len(tasks))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(
+            lambda t: download_image(t[0], t[1], session, force), tasks
+        ))
+
+
+def _normalize_photos(media_list: dict | list | None) -> list[dict]:
+    """
+    将不同格式的 media 字段统一为图片列表。
+
+    media 可能是 dict 含 photos / all 列表，也可能是 list。
+    """
+    if not media_list:
+        return []
+    if isinstance(media_list, dict):
+        photos = media_list.get("photos")
+        if photos:
+            return photos
+        # 如果 all 字段下有更多信息
+        media_list = media_list.get("all") or []
+    return [m for m in media_list if m.get("type") == "photo"]
+
+
+def _get_tweet_photos(tweet_data: dict) -> list[dict]:
+    """取出推文中的图片列表"""
+    # 尝试另一种格式 medias
+    media_list = tweet_data.get("media") or tweet_data.get("medias")
+    return _normalize_photos(media_list)
+
+
 def download_tweet_images(
-    tweet_data: dict, images_dir: Path
+    tweet_data: dict, images_dir: Path, force: bool = False
 ) -> list[dict]:
     """
     下载推文中的所有图片。
@@ -182,44 +393,54 @@ def download_tweet_images(
     Returns:
         下载结果列表: [{"url": ..., "local_path": ..., "filename": ...}, ...]
     """
-    media_list = tweet_data.get("media", {})
-    if not media_list:
-        # 尝试另一种格式
-        media_list = tweet_data.get("medias", [])
+    return download_thread_images([tweet_data], images_dir, force)[0]
 
-    photos = []
 
-    # media 可能是 dict 含 photos 列表，也可能是 list
-    if isinstance(media_list, dict):
-        photos = media_list.get("photos", [])
-        # 如果 all 字段下有更多信息
-        all_media = media_list.get("all", [])
-        if not photos and all_media:
-            photos = [m for m in all_media if m.get("type") == "photo"]
-    elif isinstance(media_list, list):
-        photos = [m for m in media_list if m.get("type") == "photo"]
+def download_thread_images(
+    tweets: list[dict], images_dir: Path, force: bool = False
+) -> list[list[dict]]:
+    """
+    一次性并发下载多条推文（Thread）中的所有图片。
 
-    if not photos:
-        print("📷 该推文没有图片")
-        return []
+    单条推文的图片命名为 1.jpg, 2.jpg ...；
+    Thread 中按 "<推文序号>_<图片序号>" 命名，避免互相覆盖。
 
-    print(f"📷 发现 {len(photos)} 张图片，开始下载...")
+    Returns:
+        与 tweets 顺序一致的下载结果列表，每项同 download_tweet_images
+    """
+    # 先规划所有下载任务，再并发下载
+    images_dir_str = str(images_dir)
+    planned = []
+    for t_idx, tweet in enumerate(tweets):
+        prefix = f"{t_idx + 1}_" if len(tweets) > 1 else ""
+        for i, photo in enumerate(_get_tweet_photos(tweet), 1):
+            img_url = photo.get("url", "")
+            if not img_url:
+                continue
+
+            # 从 URL 提取文件扩展名
+            ext = _get_image_extension(img_url)
+            filename = f"{prefix}{i}{ext}"
+            planned.append((t_idx, i, img_url, filename, photo))
 
-    results = []
-    for i, photo in enumerate(photos, 1):
-        img_url = photo.get("url", "")
-        if not img_url:
-            continue
+    if not planned:
+        print("📷 该推文没有图片")
+        return [[] for _ in tweets]
+
+    print(f"📷 发现 {len(planned)} 张图片，开始下载...")
 
-        # 从 URL 提取文件扩展名
-        ext = _get_image_extension(img_url)
-        filename = f"{i}{ext}"
-        save_path = images_dir / filename
+    images_dir.mkdir(parents=True, exist_ok=True)
+    ok_list = download_images([
+        (url, os.path.join(images_dir_str, filename))
+        for _, _, url, filename, _ in planned
+    ], force=force)
 
-        if download_image(img_url, save_path):
-            results.append({
+    results = [[] for _ in tweets]
+    for (t_idx, i, img_url, filename, photo), ok in zip(planned, ok_list):
+        if ok:
+            results[t_idx].append({
                 "url": img_url,
-                "local_path": str(save_path),
+                "local_path": os.path.join(images_dir_str, filename),
                 "filename": filename,
                 "alt": photo.get("altText", f"图片{i}"),
             })
@@ -227,24 +448,27 @@ def download_tweet_images(
     return results
 
 
+# 匹配图片 URL 路径末尾的扩展名
+IMG_EXT_RE = re.compile(r"^[^?#]*?\.(jpe?g|png|gif|webp)(?=[?#]|$)",
+                        re.IGNORECASE)
+
+# 匹配图片 URL 查询参数中的 format=xxx
+FORMAT_RE = re.compile(r"[?&]format=(\w+)")
+
+
 def _get_image_extension(url: str) -> str:
     """从 URL 中提取图片扩展名"""
     # Twitter 图片 URL 格式:
     # https://pbs.twimg.com/media/xxx.jpg
     # https://pbs.twimg.com/media/xxx?format=jpg&name=large
-    parsed = urlparse(url)
-    path = parsed.path
-
-    # 直接从路径获取扩展名
-    _, ext = os.path.splitext(path)
-    if ext in (".jpg", ".jpeg", ".png", ".gif", ".webp"):
-        return ext
+    match = IMG_EXT_RE.match(url)
+    if match:
+        return "." + match.group(1).lower()
 
     # 从查询参数获取
-    if "format=" in url:
-        match = re.search(r"format=(\w+)", url)
-        if match:
-            return f".{match.group(1)}"
+    match = FORMAT_RE.search(url)
+    if match:
+        return "." + match.group(1)
 
     return ".jpg"  # 默认
 
@@ -254,215 +478,335 @@ def _get_image_extension(url: str) -> str:
 # ============================================================
 
 
+# 列表类块
+LIST_BLOCK_TYPES = frozenset({"ordered-list-item", "unordered-list-item"})
+
+
+def _render_unstyled_block(text: str) -> tuple[str, bool]:
+    """普通段落；空段落输出一个空行"""
+    if text.strip():
+        return text, True
+    return "", False
+
+
+def _render_default_block(text: str) -> tuple[str, bool] | None:
+    """未知类型，当作普通文本；空内容跳过"""
+    if text.strip():
+        return text, True
+    return None
+
+
+# 块类型 -> 渲染函数，返回 (渲染后的行, 是否追加空行)
+# ordered-list-item 需要计数、atomic 需要下载结果，在主循环中单独处理
+BLOCK_RENDERERS = {
+    "header-one": lambda t: (f"# {t}", True),
+    "header-two": lambda t: (f"## {t}", True),
+    "header-three": lambda t: (f"### {t}", True),
+    "unordered-list-item": lambda t: (f"- {t}", False),
+    "blockquote": lambda t: (f"> {t}", True),
+    "unstyled": _render_unstyled_block,
+}
+
+
 def convert_article_to_markdown(
     article: dict,
-    entity_map: list,
+    entity_map: list | dict,
     images_dir: Path,
     images_dir_name: str,
     media_url_map: dict | None = None,
-) -> tuple[str, int]:
+    image_results: dict | None = None,
+) -> tuple[str, list[dict]]:
     """
     将 X Article 的 Draft.js blocks 转换为 Markdown。
 
+    Args:
+        image_results: 已下载图片 {url: (filename, success)}；
+            为 None 时在渲染前自行并发下载文章内嵌图片
+
     Returns:
-        (markdown_text, downloaded_image_count)
+        (markdown_text, images)，markdown_text 每行以换行结尾；
+        images 为正文中引用的图片:
+        [{"url": ..., "local_path": ..., "filename": ..., "alt": ...}, ...]
     """
     content = article.get("content", {})
     blocks = content.get("blocks", [])
-
-    # 构建 entity map 索引 (key -> value)
-    entity_dict = {}
-    if isinstance(entity_map, list):
-        for item in entity_map:
-            entity_dict[str(item.get("key", ""))] = item.get("value", {})
-    elif isinstance(entity_map, dict):
-        entity_dict = entity_map
-
-    lines = []
-    img_counter = 0
+    entity_dict = _build_entity_dict(entity_map)
+
+    # 第一遍：收集所有原子块中的图片，并发下载
+    if image_results is None:
+        planned = _plan_article_images(blocks, entity_dict, media_url_map)
+        image_results = _download_planned_images(planned, images_dir)
+
+    # 第二遍：渲染 Markdown
+    image_prefix = images_dir_name + "/"
+    images_dir_str = str(images_dir)
+    buf = io.StringIO()
+    images = []
+    seen_urls = set()
     list_counter = 0
     prev_type = ""
 
     for block in blocks:
         block_type = block.get("type", "unstyled")
-        text = block.get("text", "")
         entity_ranges = block.get("entityRanges", [])
-        inline_styles = block.get("inlineStyleRanges", [])
-
-        # 应用内联样式 (Bold, Italic)
-        styled_text = _apply_inline_styles(text, inline_styles)
-
-        # 应用 entity（链接等）
-        styled_text = _apply_entities(styled_text, text, entity_ranges, entity_dict)
 
         # 列表计数器管理
         if block_type != "ordered-list-item":
             list_counter = 0
 
         # 块类型分隔
-        if prev_type in ("ordered-list-item", "unordered-list-item") and \
-           block_type not in ("ordered-list-item", "unordered-list-item"):
-            lines.append("")  # 列表结束后空行
-
-        if block_type == "header-one":
-            lines.append(f"# {styled_text}")
-            lines.append("")
-        elif block_type == "header-two":
-            lines.append(f"## {styled_text}")
-            lines.append("")
-        elif block_type == "header-three":
-            lines.append(f"### {styled_text}")
-            lines.append("")
-        elif block_type == "ordered-list-item":
-            list_counter += 1
-            lines.append(f"{list_counter}. {styled_text}")
-        elif block_type == "unordered-list-item":
-            lines.append(f"- {styled_text}")
-        elif block_type == "blockquote":
-            lines.append(f"> {styled_text}")
-            lines.append("")
-        elif block_type == "atomic":
+        if prev_type in LIST_BLOCK_TYPES and block_type not in LIST_BLOCK_TYPES:
+            buf.write("\n")  # 列表结束后空行
+
+        if block_type == "atomic":
             # 原子块：代码块、图片等
             result = _render_atomic_block(entity_ranges, entity_dict,
-                                          images_dir, images_dir_name,
-                                          img_counter, media_url_map)
+                                          image_prefix, image_results,
+                                          len(images), media_url_map)
             if result:
-                md_text, new_imgs = result
-                lines.append(md_text)
-                lines.append("")
-                img_counter += new_imgs
-        elif block_type == "unstyled":
-            if styled_text.strip():
-                lines.append(styled_text)
-                lines.append("")
-            else:
-                lines.append("")
+                md_text, image = result
+                _write_paragraph(buf, md_text)
+                if image and image["url"] not in seen_urls:
+                    seen_urls.add(image["url"])
+                    images.append({
+                        "url": image["url"],
+                        "local_path": os.path.join(images_dir_str,
+                                                   image["filename"]),
+                        "filename": image["filename"],
+                        "alt": image["alt"],
+                    })
+            prev_type = block_type
+            continue
+
+        text = block.get("text", "")
+        inline_styles = block.get("inlineStyleRanges", [])
+
+        # 应用内联样式 (Bold, Italic) 和 entity（链接等）
+        styled_text = _apply_styles_and_entities(text, inline_styles,
+                                                 entity_ranges, entity_dict)
+
+        if block_type == "ordered-list-item":
+            list_counter += 1
+            rendered = (f"{list_counter}. {styled_text}", False)
         else:
-            # 未知类型，当作普通文本
-            if styled_text.strip():
-                lines.append(styled_text)
-                lines.append("")
+            renderer = BLOCK_RENDERERS.get(block_type, _render_default_block)
+            rendered = renderer(styled_text)
+
+        if rendered:
+            line, needs_blank = rendered
+            buf.write(line)
+            buf.write("\n\n" if needs_blank else "\n")
 
         prev_type = block_type
 
-    return "\n".join(lines), img_counter
+    return buf.getvalue(), images
 
 
-def _apply_inline_styles(text: str, styles: list) -> str:
-    """应用内联样式（Bold, Italic）到文本"""
-    if not styles or not text:
-        return text
+def _build_entity_dict(entity_map: list | dict | None) -> dict:
+    """构建 entity map 索引 (key -> value)，已是 dict 时原样返回"""
+    if isinstance(entity_map, dict):
+        return entity_map
+    return {
+        str(item.get("key", "")): item.get("value", {})
+        for item in entity_map or ()
+    }
 
-    # 按 offset 降序排列，从后向前替换避免偏移错误
-    sorted_styles = sorted(styles, key=lambda s: s["offset"], reverse=True)
 
-    chars = list(text)
-    for style in sorted_styles:
-        offset = style.get("offset", 0)
-        length = style.get("length", 0)
-        style_type = style.get("style", "")
+def _plan_article_images(blocks: list, entity_dict: dict,
+                         media_url_map: dict | None = None) -> dict[str, str]:
+    """
+    收集所有原子块中的图片 URL 并分配文件名。
 
-        if offset + length > len(chars):
+    Returns:
+        {url: filename}，按文章中出现的顺序
+    """
+    planned = {}
+    for block in blocks:
+        if block.get("type") != "atomic":
             continue
+        img_url = _get_atomic_image_url(block.get("entityRanges", []),
+                                        entity_dict, media_url_map)
+        if img_url and img_url not in planned:
+            ext = _get_image_extension(img_url)
+            planned[img_url] = f"article_{len(planned) + 1}{ext}"
+    return planned
 
-        segment = "".join(chars[offset:offset + length])
 
-        if style_type == "Bold":
-            replacement = f"**{segment}**"
-        elif style_type == "Italic":
-            replacement = f"*{segment}*"
-        else:
-            replacement = segment
+def _download_planned_images(planned: dict[str, str], images_dir: Path,
+                             force: bool = False,
+                             ) -> dict[str, tuple[str, bool]]:
+    """
+    并发下载已规划的图片。
 
-        chars[offset:offset + length] = list(replacement)
+    Returns:
+        {url: (filename, success)}
+    """
+    if not planned:
+        return {}
+
+    images_dir.mkdir(parents=True, exist_ok=True)
+    images_dir_str = str(images_dir)
+    tasks = [
+        (url, os.path.join(images_dir_str, filename))
+        for url, filename in planned.items()
+    ]
+    ok_list = download_images(tasks, force=force)
+    return {
+        url: (filename, ok)
+        for (url, filename), ok in zip(planned.items(), ok_list)
+    }
+
+
+def _write_paragraph(buf: io.StringIO, text: str) -> None:
+    """写入一段内容并在其后留一个空行"""
+    buf.write(text)
+    buf.write("\n\n")
+
+
+# 内联样式 -> Markdown 标记
+STYLE_MARKERS = {
+    "Bold": "**",
+    "Italic": "*",
+}
 
-    return "".join(chars)
 
+def _apply_styles_and_entities(text: str, styles: list,
+                               entity_ranges: list, entity_dict: dict) -> str:
+    """应用内联样式（Bold, Italic）和实体（链接等）到文本"""
+    if not text or not (styles or entity_ranges):
+        return text
 
-def _apply_entities(styled_text: str, original_text: str,
-                    entity_ranges: list, entity_dict: dict) -> str:
-    """应用实体（链接等）到文本"""
-    if not entity_ranges:
-        return styled_text
-
-    for er in sorted(entity_ranges, key=lambda e: e.get("offset", 0), reverse=True):
-        key = str(er.get("key", ""))
-        entity = entity_dict.get(key, {})
-        entity_type = entity.get("type", "")
-        entity_data = entity.get("data", {})
-
-        if entity_type == "LINK":
-            url = entity_data.get("url", "")
-            offset = er.get("offset", 0)
-            length = er.get("length", 0)
-            link_text = original_text[offset:offset + length]
-            if link_text and url:
-                styled_text = styled_text.replace(
-                    link_text, f"[{link_text}]({url})", 1
-                )
+    # 区间: (offset, length, 开始标记, 结束标记)
+    spans = []
+    for style in styles:
+        marker = STYLE_MARKERS.get(style.get("style", ""))
+        if marker:
+            spans.append((style.get("offset", 0), style.get("length", 0),
+                          marker, marker))
+
+    for er in entity_ranges:
+        entity = entity_dict.get(str(er.get("key", "")), {})
+        if entity.get("type") == "LINK":
+            url = entity.get("data", {}).get("url", "")
+            if url:
+                spans.append((er.get("offset", 0), er.get("length", 0),
+                              "[", f"]({url})"))
         # TWEMOJI 不处理，保留原文 emoji
 
-    return styled_text
+    # 收集每个位置上开始/结束的区间；同一位置先开较长的区间，保证嵌套正确
+    starts: dict[int, list[int]] = {}
+    ends: dict[int, list[int]] = {}
+    spans.sort(key=lambda sp: (sp[0], -sp[1]))
+    for idx, (offset, length, _, _) in enumerate(spans):
+        if length <= 0 or offset + length > len(text):
+            continue
+        starts.setdefault(offset, []).append(idx)
+        ends.setdefault(offset + length, []).append(idx)
+
+    if not starts:
+        return text
 
+    # 单次扫描：按边界切分原文，在边界处插入标记
+    parts = []
+    stack = []
+    cursor = 0
+    for pos in sorted(starts.keys() | ends.keys()):
+        parts.append(text[cursor:pos])
+        cursor = pos
+
+        closing = set(ends.get(pos, ()))
+        reopen = []
+        while closing:
+            idx = stack.pop()
+            parts.append(spans[idx][3])
+            if idx in closing:
+                closing.remove(idx)
+            else:
+                # 交叉区间：先关闭内层，稍后重新打开
+                reopen.append(idx)
+        for idx in reversed(reopen):
+            parts.append(spans[idx][2])
+            stack.append(idx)
 
-def _render_atomic_block(entity_ranges: list, entity_dict: dict,
-                         images_dir: Path, images_dir_name: str,
-                         img_counter: int,
-                         media_url_map: dict | None = None,
-                         ) -> tuple[str, int] | None:
-    """渲染原子块（代码块、图片等）"""
+        for idx in starts.get(pos, ()):
+            parts.append(spans[idx][2])
+            stack.append(idx)
+
+    parts.append(text[cursor:])
+    return "".join(parts)
+
+
+def _get_atomic_entity(entity_ranges: list,
+                       entity_dict: dict) -> tuple[str, dict]:
+    """取出原子块关联的 entity (type, data)"""
     if not entity_ranges:
-        return None
+        return "", {}
 
     er = entity_ranges[0]
     key = str(er.get("key", ""))
     entity = entity_dict.get(key, {})
-    entity_type = entity.get("type", "")
-    entity_data = entity.get("data", {})
+    return entity.get("type", ""), entity.get("data", {})
 
-    if entity_type == "MARKDOWN":
-        # 代码块
-        md_content = entity_data.get("markdown", "")
-        return md_content.strip(), 0
 
-    elif entity_type == "IMAGE":
-        # 文章内嵌图片（直接含 URL）
-        img_url = entity_data.get("src", "") or entity_data.get("url", "")
-        if img_url:
-            img_counter += 1
-            ext = _get_image_extension(img_url)
-            filename = f"article_{img_counter}{ext}"
-            save_path = images_dir / filename
-            if download_image(img_url, save_path):
-                alt = entity_data.get("alt", f"文章图片{img_counter}")
-                return f"![{alt}]({images_dir_name}/{filename})", 1
-        return None
+def _get_atomic_image_url(entity_ranges: list, entity_dict: dict,
+                          media_url_map: dict | None = None) -> str:
+    """解析原子块中的图片 URL，非图片块返回空字符串"""
+    entity_type, entity_data = _get_atomic_entity(entity_ranges, entity_dict)
 
-    elif entity_type == "MEDIA":
-        # 媒体内容：通过 mediaItems -> mediaId 查找 URL
-        img_url = ""
-        caption = entity_data.get("caption", "")
+    if entity_type == "IMAGE":
+        # 文章内嵌图片（直接含 URL）
+        return entity_data.get("src", "") or entity_data.get("url", "")
 
+    if entity_type == "MEDIA":
         # 方式1：通过 media_url_map 查找（mediaItems -> mediaId）
         media_items = entity_data.get("mediaItems", [])
         if media_items and media_url_map:
             media_id = media_items[0].get("mediaId", "")
             img_url = media_url_map.get(str(media_id), "")
+            if img_url:
+                return img_url
 
         # 方式2：直接从 media_info 获取
-        if not img_url:
-            media_info = entity_data.get("media_info", {})
-            img_url = media_info.get("original_img_url", "")
+        media_info = entity_data.get("media_info", {})
+        return media_info.get("original_img_url", "")
 
-        if img_url:
-            img_counter += 1
-            ext = _get_image_extension(img_url)
-            filename = f"article_{img_counter}{ext}"
-            save_path = images_dir / filename
-            if download_image(img_url, save_path):
-                alt = caption.strip() if caption else f"文章图片{img_counter}"
-                return f"![{alt}]({images_dir_name}/{filename})", 1
-        return None
+    return ""
+
+
+def _render_atomic_block(entity_ranges: list, entity_dict: dict,
+                         image_prefix: str, image_results: dict,
+                         img_counter: int,
+                         media_url_map: dict | None = None,
+                         ) -> tuple[str, dict | None] | None:
+    """
+    渲染原子块（代码块、图片等），图片需已下载完成。
+
+    Returns:
+        (markdown_text, image)，image 为图片信息 {"url", "filename", "alt"}，
+        非图片块为 None
+    """
+    entity_type, entity_data = _get_atomic_entity(entity_ranges, entity_dict)
+
+    if entity_type == "MARKDOWN":
+        # 代码块
+        md_content = entity_data.get("markdown", "")
+        return md_content.strip(), None
+
+    if entity_type in ("IMAGE", "MEDIA"):
+        img_url = _get_atomic_image_url(entity_ranges, entity_dict,
+                                        media_url_map)
+        filename, ok = image_results.get(img_url, ("", False))
+        if not ok:
+            return None
+
+        img_counter += 1
+        if entity_type == "IMAGE":
+            alt = entity_data.get("alt", f"文章图片{img_counter}")
+        else:
+            caption = entity_data.get("caption", "")
+            alt = caption.strip() if caption else f"文章图片{img_counter}"
+        image = {"url": img_url, "filename": filename, "alt": alt}
+        return f"![{alt}]({image_prefix}{filename})", image
 
     return None
 
@@ -473,14 +817,16 @@ def generate_article_markdown(
     images_dir: Path,
     images_dir_name: str,
     original_url: str,
-) -> tuple[str, int]:
+    force: bool = False,
+) -> tuple[str, list[dict]]:
     """
     将 X Article 转为完整 Markdown。
 
     Returns:
-        (markdown_text, total_image_count)
+        (markdown_text, images)，images 含封面和正文图片:
+        [{"url": ..., "local_path": ..., "filename": ..., "alt": ...}, ...]
     """
-    author = tweet_data.get("author", {})
+    author = tweet_data.get("author") or {}
     author_name = author.get("name", "Unknown")
     author_screen = author.get("screen_name", "unknown")
 
@@ -498,42 +844,21 @@ def generate_article_markdown(
     replies = format_number(tweet_data.get("replies", 0))
     views = format_number(tweet_data.get("views", 0))
 
-    lines = []
+    buf = io.StringIO()
 
     # 标题
     if title:
-        lines.append(f"# {title}")
+        _write_paragraph(buf, f"# {title}")
     else:
-        lines.append(f"# @{author_screen} 的文章")
-    lines.append("")
+        _write_paragraph(buf, f"# @{author_screen} 的文章")
 
     # 作者和元信息
-    lines.append(f"> ✍️ @{author_screen} ({author_name})")
-    lines.append(f"> 📅 {created_at} | "
-                 f"❤️ {likes} | "
-                 f"🔁 {retweets} | "
-                 f"💬 {replies} | "
-                 f"👁️ {views}")
-    lines.append("")
-
-    # 封面图
-    cover = article.get("cover_media", {})
-    cover_img_count = 0
-    if cover:
-        media_info = cover.get("media_info", {})
-        cover_url = media_info.get("original_img_url", "")
-        if cover_url:
-            ext = _get_image_extension(cover_url)
-            filename = f"cover{ext}"
-            save_path = images_dir / filename
-            print(f"📷 下载封面图片...")
-            if download_image(cover_url, save_path):
-                lines.append(f"![封面]({images_dir_name}/{filename})")
-                lines.append("")
-                cover_img_count = 1
-
-    lines.append("---")
-    lines.append("")
+    buf.write(f"> ✍️ @{author_screen} ({author_name})\n")
+    _write_paragraph(buf, f"> 📅 {created_at} | "
+                          f"❤️ {likes} | "
+                          f"🔁 {retweets} | "
+                          f"💬 {replies} | "
+                          f"👁️ {views}")
 
     # 构建 media_id -> URL 查找表
     media_url_map = {}
@@ -544,28 +869,58 @@ def generate_article_markdown(
         if mid and url:
             media_url_map[mid] = url
 
-    if media_url_map:
-        print(f"📷 发现 {len(media_url_map)} 张文章内嵌图片，开始下载...")
-
-    # 文章正文
     content = article.get("content", {})
     entity_map = content.get("entityMap", [])
+    entity_dict = _build_entity_dict(entity_map)
+
+    # 先规划封面和文章内嵌图片，一次性并发下载，再渲染正文
+    cover = article.get("cover_media") or {}
+    cover_url = (cover.get("media_info") or {}).get("original_img_url", "")
+    planned = {}
+    if cover_url:
+        planned[cover_url] = f"cover{_get_image_extension(cover_url)}"
+    for url, filename in _plan_article_images(content.get("blocks", []),
+                                              entity_dict,
+                                              media_url_map).items():
+        planned.setdefault(url, filename)
+
+    image_results = {}
+    if planned:
+        print(f"📷 发现 {len(planned)} 张图片，开始下载...")
+        image_results = _download_planned_images(planned, images_dir, force)
+        ok_count = sum(ok for _, ok in image_results.values())
+        print(f"📷 图片下载完成: {ok_count}/{len(planned)}")
 
-    article_md, article_img_count = convert_article_to_markdown(
-        article, entity_map, images_dir, images_dir_name, media_url_map
+    # 封面图
+    images = []
+    if cover_url:
+        filename, ok = image_results[cover_url]
+        if ok:
+            _write_paragraph(buf, f"![封面]({images_dir_name}/{filename})")
+            images.append({
+                "url": cover_url,
+                "local_path": os.path.join(str(images_dir), filename),
+                "filename": filename,
+                "alt": "封面",
+            })
+
+    _write_paragraph(buf, "---")
+
+    # 文章正文
+    article_md, article_images = convert_article_to_markdown(
+        article, entity_dict, images_dir, images_dir_name, media_url_map,
+        image_results,
     )
-    lines.append(article_md)
+    buf.write(article_md)
 
     # 来源
-    lines.append("")
-    lines.append("---")
-    lines.append("")
+    buf.write("\n")
+    _write_paragraph(buf, "---")
     tweet_url = tweet_data.get("url", original_url)
-    lines.append(f"*来源: [{tweet_url}]({tweet_url})*")
-    lines.append("")
+    buf.write(f"*来源: [{tweet_url}]({tweet_url})*\n")
 
-    total_images = cover_img_count + article_img_count
-    return "\n".join(lines), total_images
+    images.extend(img for img in article_images if img["url"] != cover_url)
+    return buf.getvalue(), images
 
 
 # ============================================================
@@ -589,15 +944,62 @@ def format_number(num) -> str:
     return str(num)
 
 
+MONTHS = {
+    "Jan": 1, "Feb": 2, "Mar": 3, "Apr": 4, "May": 5, "Jun": 6,
+    "Jul": 7, "Aug": 8, "Sep": 9, "Oct": 10, "Nov": 11, "Dec": 12,
+}
+WEEKDAYS = frozenset({"Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"})
+
+
+def _parse_tweet_date(date_str: str) -> datetime:
+    """
+    解析 FxTwitter 的固定日期格式 "Wed Oct 10 20:19:24 +0000 2018"。
+
+    与 strptime(date_str, "%a %b %d %H:%M:%S %z %Y") 结果一致，
+    但不依赖 locale，也不必每次构建 strptime 的正则；
+    时、分、秒要求两位数字（比 strptime 更严格）。
+
+    Raises:
+        ValueError: 如果格式不匹配
+    """
+    parts = date_str.split(" ")
+    if len(parts) != 6:
+        raise ValueError(f"无法解析日期: {date_str}")
+
+    weekday, month, day, clock, tz, year = parts
+    if weekday not in WEEKDAYS or month not in MONTHS:
+        raise ValueError(f"无法解析日期: {date_str}")
+    if len(tz) != 5 or tz[0] not in "+-" or not tz[1:].isdigit():
+        raise ValueError(f"无法解析时区: {tz}")
+
+    clock_parts = clock.split(":")
+    # int() 会接受正负号、下划线和空白，这里逐段校验纯数字及位数
+    if not (len(year) == 4 and year.isdigit()
+            and 1 <= len(day) <= 2 and day.isdigit()
+            and len(clock_parts) == 3
+            and all(len(part) == 2 and part.isdigit()
+                    for part in clock_parts)):
+        raise ValueError(f"无法解析日期: {date_str}")
+
+    hour, minute, second = clock_parts
+    offset = timedelta(hours=int(tz[1:3]), minutes=int(tz[3:5]))
+    if tz[0] == "-":
+        offset = -offset
+
+    return datetime(int(year), MONTHS[month], int(day),
+                    int(hour), int(minute), int(second),
+                    tzinfo=timezone(offset))
+
+
 def format_tweet_date(date_str: str) -> str:
     """格式化推文日期"""
     if not date_str:
         return "未知日期"
     try:
         # FxTwitter 返回的日期格式: "Wed Oct 10 20:19:24 +0000 2018"
-        dt = datetime.strptime(date_str, "%a %b %d %H:%M:%S %z %Y")
+        dt = _parse_tweet_date(date_str)
         return dt.strftime("%Y-%m-%d %H:%M:%S")
-    except (ValueError, TypeError):
+    except (ValueError, TypeError, AttributeError):
         return date_str
 
 
@@ -606,14 +1008,17 @@ def generate_markdown(
     images: list[dict],
     images_dir_name: str,
     original_url: str,
+    title: str | None = None,
 ) -> str:
     """
     将推文数据转为 Markdown 格式字符串。
+
+    Args:
+        title: 自定义一级标题（不含 "# "），默认为 "@用户 (名称) 的推文"
     """
-    author = tweet_data.get("author", {})
+    author = tweet_data.get("author") or {}
     author_name = author.get("name", "Unknown")
     author_screen = author.get("screen_name", "unknown")
-    author_avatar = author.get("avatar_url", "")
 
     tweet_text = tweet_data.get("text", "")
     created_at = format_tweet_date(tweet_data.get("created_at", ""))
@@ -624,55 +1029,55 @@ def generate_markdown(
     replies = format_number(tweet_data.get("replies", 0))
     views = format_number(tweet_data.get("views", 0))
 
-    lines = []
+    buf = io.StringIO()
 
     # 标题
-    lines.append(f"# @{author_screen} ({author_name}) 的推文\n")
+    if title is None:
+        title = f"@{author_screen} ({author_name}) 的推文"
+    _write_paragraph(buf, f"# {title}")
 
     # 元信息
-    lines.append(f"> 📅 {created_at} | "
-                 f"❤️ {likes} | "
-                 f"🔁 {retweets} | "
-                 f"💬 {replies} | "
-                 f"👁️ {views}\n")
+    _write_paragraph(buf, f"> 📅 {created_at} | "
+                          f"❤️ {likes} | "
+                          f"🔁 {retweets} | "
+                          f"💬 {replies} | "
+                          f"👁️ {views}")
 
-    lines.append("---\n")
+    _write_paragraph(buf, "---")
 
     # 正文
     if tweet_text:
-        lines.append(f"{tweet_text}\n")
+        _write_paragraph(buf, tweet_text)
 
     # 图片
     if images:
-        lines.append("")
+        buf.write("\n")
+        image_prefix = images_dir_name + "/"
         for img in images:
             alt = img.get("alt", "图片")
-            rel_path = f"{images_dir_name}/{img['filename']}"
-            lines.append(f"![{alt}]({rel_path})\n")
+            _write_paragraph(buf, f"![{alt}]({image_prefix}{img['filename']})")
 
     # 视频提示
-    media = tweet_data.get("media", {})
-    videos = []
-    if isinstance(media, dict):
-        videos = media.get("videos", [])
+    media = tweet_data.get("media")
+    videos = media.get("videos") if isinstance(media, dict) else None
     if videos:
-        lines.append("\n> 🎬 该推文包含视频，请访问原文查看\n")
+        _write_paragraph(buf, "\n> 🎬 该推文包含视频，请访问原文查看")
 
     # 引用推文
     quote = tweet_data.get("quote")
     if quote:
-        lines.append("\n---\n")
-        lines.append("### 引用推文\n")
-        quote_author = quote.get("author", {})
+        _write_paragraph(buf, "\n---")
+        _write_paragraph(buf, "### 引用推文")
+        quote_author = quote.get("author") or {}
         quote_screen = quote_author.get("screen_name", "unknown")
         quote_text = quote.get("text", "")
-        lines.append(f"> **@{quote_screen}**: {quote_text}\n")
+        _write_paragraph(buf, f"> **@{quote_screen}**: {quote_text}")
 
     # 来源
-    lines.append("\n---\n")
-    lines.append(f"*来源: [{tweet_url}]({tweet_url})*\n")
+    _write_paragraph(buf, "\n---")
+    buf.write(f"*来源: [{tweet_url}]({tweet_url})*\n")
 
-    return "\n".join(lines)
+    return buf.getvalue()
 
 
 # ============================================================
@@ -680,7 +1085,8 @@ def generate_markdown(
 # ============================================================
 
 
-def fetch_thread(tweet_data: dict, screen_name: str) -> list[dict]:
+def fetch_thread(tweet_data: dict, screen_name: str,
+                 use_cache: bool = True, refresh: bool = False) -> list[dict]:
     """
     尝试获取推文所在的 Thread.
 
@@ -695,7 +1101,7 @@ def fetch_thread(tweet_data: dict, screen_name: str) -> list[dict]:
     # 检查是否有对话 / thread 信息
     # FxTwitter API 中 conversation 相关字段
     replying_to = tweet_data.get("replying_to")
-    tweet_author = tweet_data.get("author", {}).get("screen_name", "")
+    tweet_author = (tweet_data.get("author") or {}).get("screen_name", "")
 
     if not replying_to:
         return thread
@@ -711,8 +1117,8 @@ def fetch_thread(tweet_data: dict, screen_name: str) -> list[dict]:
             break
 
         try:
-            parent = fetch_tweet(reply_id, screen_name)
-            parent_author = parent.get("author", {}).get("screen_name", "")
+            parent = fetch_tweet(reply_id, screen_name, use_cache, refresh)
+            parent_author = (parent.get("author") or {}).get("screen_name", "")
 
             # 只追溯同一作者的 thread
             if parent_author.lower() != tweet_author.lower():
@@ -721,7 +1127,6 @@ def fetch_thread(tweet_data: dict, screen_name: str) -> list[dict]:
             visited.add(reply_id)
             thread.insert(0, parent)  # 插入到最前面
             current = parent
-            time.sleep(0.5)  # 避免请求过快
 
         except Exception:
             break
@@ -737,10 +1142,34 @@ def fetch_thread(tweet_data: dict, screen_name: str) -> list[dict]:
 # ============================================================
 
 
+def _write_markdown(md_path: Path, text: str) -> None:
+    """
+    原子写入 Markdown 文件：整篇一次写入临时文件，fsync 后 rename 覆盖，
+    中途失败不会留下半截文件。
+    """
+    tmp_path = md_path.with_suffix(".md.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(text.encode("utf-8"))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, md_path)
+
+
+def _write_json(md_path: Path, data: dict) -> Path:
+    """在 Markdown 旁写入同名 .json 数据文件，供下游工具直接读取"""
+    json_path = md_path.with_suffix(".json")
+    json_path.write_bytes(_json_dumps(data, indent=True))
+    return json_path
+
+
 def download_tweet(
     url: str,
     output_dir: str = "output",
     include_thread: bool = True,
+    use_cache: bool = True,
+    refresh: bool = False,
+    force: bool = False,
+    export_json: bool = False,
 ) -> str:
     """
     主函数：下载推文并保存为 Markdown。
@@ -749,6 +1178,10 @@ def download_tweet(
         url: X/Twitter 推文链接
         output_dir: 输出目录
         include_thread: 是否尝试获取整个 Thread
+        use_cache: 是否使用推文数据磁盘缓存
+        refresh: 忽略已有缓存，重新获取推文数据
+        force: 强制重新下载本地已存在的图片
+        export_json: 同时导出原始推文数据为同名 .json 文件
 
     Returns:
         生成的 Markdown 文件路径
@@ -763,10 +1196,11 @@ def download_tweet(
     print(f"🆔 推文 ID: {tweet_id}\n")
 
     # 2. 获取推文数据
-    tweet_data = fetch_tweet(tweet_id, screen_name)
+    tweet_data = fetch_tweet(tweet_id, screen_name, use_cache, refresh)
 
     # 实际作者可能与 URL 中的不同
-    actual_author = tweet_data.get("author", {}).get("screen_name", screen_name)
+    author = tweet_data.get("author") or {}
+    actual_author = author.get("screen_name", screen_name)
 
     # 3. 构建输出路径
     output_path = Path(output_dir)
@@ -781,16 +1215,24 @@ def download_tweet(
     article = tweet_data.get("article")
     if article and article.get("content"):
         print(f"📰 检测到 X Article: {article.get('title', '无标题')}")
-        final_md, total_images = generate_article_markdown(
-            tweet_data, article, images_dir, images_dir_name, url
+        final_md, images = generate_article_markdown(
+            tweet_data, article, images_dir, images_dir_name, url, force
         )
-
-        with open(md_path, "w", encoding="utf-8") as f:
-            f.write(final_md)
+        total_images = len(images)
+
+        _write_markdown(md_path, final_md)
+        json_path = None
+        if export_json:
+            json_path = _write_json(md_path, {
+                "tweet": tweet_data,
+                "images": images,
+            })
 
         print(f"\n{'='*50}")
         print(f"✅ 下载完成!")
         print(f"📄 Markdown: {md_path}")
+        if json_path:
+            print(f"🗂️ JSON: {json_path}")
         if total_images > 0:
             print(f"📷 图片目录: {images_dir} ({total_images} 张)")
         print(f"{'='*50}\n")
@@ -798,25 +1240,26 @@ def download_tweet(
 
     # 5. 普通推文：获取 Thread（可选）
     if include_thread:
-        tweets = fetch_thread(tweet_data, actual_author)
+        tweets = fetch_thread(tweet_data, actual_author, use_cache, refresh)
     else:
         tweets = [tweet_data]
 
-    # 6. 处理每条推文
+    # 6. 一次性并发下载所有推文的图片
+    all_images = download_thread_images(tweets, images_dir, force)
+
+    # 7. 处理每条推文
     all_md_parts = []
     total_images = 0
 
-    for idx, tweet in enumerate(tweets):
-        if len(tweets) > 1:
-            print(f"\n--- 推文 {idx + 1}/{len(tweets)} ---")
-
-        # 下载图片
-        images = download_tweet_images(tweet, images_dir)
+    for idx, (tweet, images) in enumerate(zip(tweets, all_images)):
         total_images += len(images)
 
-        # 生成 Markdown
+        # 生成 Markdown；Thread 的标题放在第一条推文上
+        title = None
+        if len(tweets) > 1 and idx == 0:
+            title = f"@{actual_author} 的推文串 (Thread, 共 {len(tweets)} 条)"
         md_content = generate_markdown(
-            tweet, images, images_dir_name, url
+            tweet, images, images_dir_name, url, title
         )
 
         if len(tweets) > 1 and idx > 0:
@@ -825,25 +1268,27 @@ def download_tweet(
 
         all_md_parts.append(md_content)
 
-    # 7. 合并并写入文件
+    # 8. 合并并写入文件
     final_md = "\n".join(all_md_parts)
 
-    # 如果是 Thread，更新标题
-    if len(tweets) > 1:
-        first_line = final_md.split("\n")[0]
-        final_md = final_md.replace(
-            first_line,
-            f"# @{actual_author} 的推文串 (Thread, 共 {len(tweets)} 条)",
-            1,
-        )
+    _write_markdown(md_path, final_md)
 
-    with open(md_path, "w", encoding="utf-8") as f:
-        f.write(final_md)
+    json_path = None
+    if export_json:
+        data = {
+            "tweet": tweet_data,
+            "images": [img for images in all_images for img in images],
+        }
+        if len(tweets) > 1:
+            data["thread"] = tweets
+        json_path = _write_json(md_path, data)
 
-    # 8. 完成报告
+    # 9. 完成报告
     print(f"\n{'='*50}")
     print(f"✅ 下载完成!")
     print(f"📄 Markdown: {md_path}")
+    if json_path:
+        print(f"🗂️ JSON: {json_path}")
     if total_images > 0:
         print(f"📷 图片目录: {images_dir} ({total_images} 张)")
     print(f"{'='*50}\n")
@@ -882,6 +1327,26 @@ def main():
         action="store_true",
         help="不获取 Thread，只下载单条推文",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="不读写推文数据缓存",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="忽略已有缓存，重新获取推文数据",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="强制重新下载本地已存在的图片",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="同时导出原始推文数据为同名 .json 文件",
+    )
 
     args = parser.parse_args()
 
@@ -890,6 +1355,10 @@ def main():
             url=args.url,
             output_dir=args.output_dir,
             include_thread=not args.no_thread,
+            use_cache=not args.no_cache,
+            refresh=args.refresh,
+            force=args.force,
+            export_json=args.json,
         )
     except ValueError as e:
         print(f"\n❌ 错误: {e}")
@@ -903,6 +1372,8 @@ def main():
     except Exception as e:
         print(f"\n❌ 意外错误: {e}")
         sys.exit(1)
+    finally:
+        SESSION.close()
 
 
 if __name__ == "__main__":